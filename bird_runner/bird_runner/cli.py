@@ -4,6 +4,8 @@ import argparse
 import asyncio
 import json
 import logging
+import logging.handlers
+import queue
 import sys
 
 from .agent_interface import AgentFactory
@@ -15,17 +17,53 @@ class TextToSQLCLI:
 
     def __init__(self):
         self.agent_factories: Dict[str, AgentFactory] = {}
+        self._parser: argparse.ArgumentParser | None = None
 
     def register_agent(self, name: str, factory: AgentFactory):
         """Register an agent factory."""
         self.agent_factories[name] = factory
+        # --agent-type choices changed, rebuild the parser on next use
+        self._parser = None
 
     def run(self):
         """Run the CLI."""
-        asyncio.run(self._async_main())
+        parser = self._get_parser()
+        args = parser.parse_args()
 
-    async def _async_main(self):
-        """Async main CLI entry point."""
+        # Check for mutually exclusive arguments
+        args_present = sum([args.question_index is not None, args.all])
+        if args_present != 1:
+            parser.error("Exactly one of --question-index or --all is required")
+
+        # Set up logging. Records are formatted and written by a background
+        # listener thread so coroutines never block on stderr.
+        log_queue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        # Only merge message and traceback here, the listener adds the rest
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        logging.basicConfig(
+            level=getattr(logging, args.log_level), handlers=[queue_handler]
+        )
+
+        listener.start()
+        try:
+            asyncio.run(self._async_main(args))
+        finally:
+            listener.stop()
+
+    def _get_parser(self) -> argparse.ArgumentParser:
+        """Return the argument parser, building it once."""
+        if self._parser is None:
+            self._parser = self._build_parser()
+        return self._parser
+
+    def _build_parser(self) -> argparse.ArgumentParser:
+        """Build the CLI argument parser."""
         parser = argparse.ArgumentParser(description="Text-to-SQL Runner")
 
         # Required arguments
@@ -53,11 +91,22 @@ class TextToSQLCLI:
             help="Max concurrent questions",
         )
 
+        parser.add_argument(
+            "--agent-timeout",
+            type=float,
+            default=300.0,
+            help="Seconds before a single question is abandoned with --all (default: 300)",
+        )
         parser.add_argument(
             "--all",
             action="store_true",
             help="Process all questions in the evaluation file (mutually exclusive with --question-index)",
         )
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help="With --all, submit every question at once through the agent's batch interface",
+        )
 
         # Database configuration
         parser.add_argument(
@@ -77,6 +126,11 @@ class TextToSQLCLI:
             help="SQL dialect to use",
         )
         parser.add_argument("--output", help="Output file path for results")
+        parser.add_argument(
+            "--print-results",
+            action="store_true",
+            help="Also print results to stdout when --output is given",
+        )
         parser.add_argument("--storage-root", help="Storage root directory")
 
         # Logging
@@ -87,19 +141,10 @@ class TextToSQLCLI:
             help="Logging level",
         )
 
-        args = parser.parse_args()
-
-        # Check for mutually exclusive arguments
-        args_present = sum([args.question_index is not None, args.all])
-        if args_present != 1:
-            parser.error("Exactly one of --question-index or --all is required")
-
-        # Set up logging
-        logging.basicConfig(
-            level=getattr(logging, args.log_level),
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        )
+        return parser
 
+    async def _async_main(self, args: argparse.Namespace):
+        """Async main CLI entry point."""
         try:
             # Get agent factory
             agent_factory = self.agent_factories[args.agent_type]
@@ -117,16 +162,19 @@ class TextToSQLCLI:
                     question_index=None,
                     sql_dialect=args.sql_dialect,
                     max_concurrent=args.max_concurrent,
+                    batch=args.batch,
+                    agent_timeout=args.agent_timeout,
                 )
 
-                results_json = json.dumps(results, indent=2)
                 # Write results to output file if specified
                 if args.output:
                     with open(args.output, "w") as f:
-                        f.write(results_json)
+                        json.dump(results, f, indent=2)
                     logging.info(f"Results written to {args.output}")
 
-                print(results_json)
+                if args.print_results or not args.output:
+                    json.dump(results, sys.stdout, indent=2)
+                    print()
             else:
                 logging.info(f"Running single question {args.question_index}")
                 final_sql = await runner.run(
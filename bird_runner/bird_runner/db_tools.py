@@ -1,14 +1,55 @@
+import functools
 import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
 
-from sqlalchemy import create_engine, inspect, Engine, Inspector
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.exc import SQLAlchemyError
 
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib parser
+    orjson = None
+
+# Per-path locks so each database is loaded once by run_load_db_info
+_DB_INFO_LOCKS: dict[str, threading.Lock] = {}
+_DB_INFO_LOCKS_GUARD = threading.Lock()
+
+# Keywords used to guess a column type from its JSON description, in
+# priority order (first match wins)
+_DDL_TYPE_KEYWORDS = (
+    ("integer", "INTEGER"),
+    ("id", "INTEGER"),
+    ("date", "DATE"),
+    ("real", "REAL"),
+    ("number", "REAL"),
+)
+
 
 def run_load_db_info(
     db_path: str,
 ) -> dict:
     """
     Load database information from SQLite file using db_root_path.
+
+    Results are cached per db_path, so each database is inspected only once
+    per process. The returned dict is shared between callers and must not be
+    mutated.
+    """
+    # Concurrent callers for the same path wait for the first load instead
+    # of each inspecting the database
+    with _DB_INFO_LOCKS_GUARD:
+        lock = _DB_INFO_LOCKS.setdefault(db_path, threading.Lock())
+    with lock:
+        return _load_db_info(db_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_db_info(db_path: str) -> dict:
+    """
+    Load and cache database information for run_load_db_info.
     """
     try:
         # Extract schema and table info
@@ -34,14 +75,16 @@ def _extract_from_database(db_path: str, dialect: str) -> tuple[str, str]:
         Tuple[str, str]: A tuple containing (schema_ddl, table_descriptions_markdown)
     """
 
+    # SQLite stores the original DDL, so skip SQLAlchemy reflection entirely
+    if dialect == "SQLite":
+        return _extract_from_sqlite(db_path)
+
     try:
         # Create connection string based on dialect
         if dialect == "MySQL":
             conn_str = ""
         elif dialect == "PostgreSQL":
             conn_str = ""
-        elif dialect == "SQLite":
-            conn_str = f"sqlite:///{db_path}"
         else:
             raise ValueError(f"Unsupported database dialect: {dialect}")
 
@@ -49,16 +92,18 @@ def _extract_from_database(db_path: str, dialect: str) -> tuple[str, str]:
         engine = create_engine(conn_str)
         inspector = inspect(engine)
 
-        # Get table names
-        table_names = inspector.get_table_names()
+        # Reflect each table's columns once and share them between the
+        # DDL and the table descriptions
+        columns_by_table = {
+            table_name: inspector.get_columns(table_name)
+            for table_name in inspector.get_table_names()
+        }
 
         # Generate DDL statements
-        schema_ddl = _extract_ddl_from_database(engine, inspector, table_names, dialect)
+        schema_ddl = _extract_ddl_from_database(columns_by_table, dialect)
 
         # Generate table descriptions (basic metadata)
-        table_descriptions = _generate_table_descriptions_from_db(
-            inspector, table_names
-        )
+        table_descriptions = _generate_table_descriptions_from_db(columns_by_table)
 
         return schema_ddl, table_descriptions
 
@@ -68,6 +113,62 @@ def _extract_from_database(db_path: str, dialect: str) -> tuple[str, str]:
         raise RuntimeError(f"Error extracting database schema: {str(e)}")
 
 
+def _extract_from_sqlite(db_path: str) -> tuple[str, str]:
+    """
+    Extract schema information from a SQLite file using the sqlite3 module.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        Tuple[str, str]: A tuple containing (schema_ddl, table_descriptions_markdown)
+    """
+    # Open read-only so a wrong path fails instead of creating an empty database
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+
+    try:
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            tables = conn.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+                "ORDER BY name"
+            ).fetchall()
+
+            # Use the stored CREATE TABLE statements as the schema DDL
+            schema_ddl = "\n\n".join(f"{sql};" for _, sql in tables)
+
+            # Generate table descriptions (basic metadata)
+            table_descriptions = _generate_table_descriptions_from_sqlite(
+                conn, [name for name, _ in tables]
+            )
+        finally:
+            conn.close()
+
+        return schema_ddl, table_descriptions
+
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Database connection error: {str(e)}")
+
+
+def _load_json_file(path: str):
+    """
+    Parse a JSON file, using orjson when it is installed.
+
+    Args:
+        path (str): Path to the JSON file
+
+    Returns:
+        The parsed JSON document
+    """
+    if orjson is not None:
+        with open(path, "rb") as file:
+            return orjson.loads(file.read())
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
 def _extract_from_json(database_name: str, json_file_path: str) -> tuple[str, str]:
     """
     Extract schema information from JSON file.
@@ -81,8 +182,7 @@ def _extract_from_json(database_name: str, json_file_path: str) -> tuple[str, st
     """
     try:
         # Read JSON file
-        with open(json_file_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+        data = _load_json_file(json_file_path)
 
         # Check if database exists
         if database_name not in data:
@@ -108,15 +208,13 @@ def _extract_from_json(database_name: str, json_file_path: str) -> tuple[str, st
 
 
 def _extract_ddl_from_database(
-    engine: Engine, inspector: Inspector, table_names: list[str], dialect: str
+    columns_by_table: dict[str, list[dict]], dialect: str
 ) -> str:
     """
     Extract actual DDL statements from database.
 
     Args:
-        engine: SQLAlchemy engine
-        inspector: SQLAlchemy inspector
-        table_names: List of table names
+        columns_by_table: Reflected columns keyed by table name
         dialect: Database dialect
 
     Returns:
@@ -124,9 +222,7 @@ def _extract_ddl_from_database(
     """
     ddl_statements = []
 
-    for table_name in table_names:
-        columns = inspector.get_columns(table_name)
-
+    for table_name, columns in columns_by_table.items():
         # Build CREATE TABLE statement
         column_defs = []
         for column in columns:
@@ -163,14 +259,11 @@ def _generate_ddl_from_json(database_info: dict) -> str:
         columns = []
         for column_name, column_desc in columns_description.items():
             # Extract a mock datatype from the description
-            if "integer" in column_desc.lower() or "id" in column_desc.lower():
-                datatype = "INTEGER"
-            elif "date" in column_desc.lower():
-                datatype = "DATE"
-            elif "real" in column_desc.lower() or "number" in column_desc.lower():
-                datatype = "REAL"
-            else:
-                datatype = "TEXT"
+            desc_lower = column_desc.lower()
+            datatype = next(
+                (t for keyword, t in _DDL_TYPE_KEYWORDS if keyword in desc_lower),
+                "TEXT",
+            )
 
             columns.append(f"  {column_name} {datatype}")
 
@@ -182,30 +275,30 @@ def _generate_ddl_from_json(database_info: dict) -> str:
 
 
 def _generate_table_descriptions_from_db(
-    inspector: Inspector, table_names: list[str]
+    columns_by_table: dict[str, list[dict]],
 ) -> str:
     """
     Generate markdown table descriptions from database inspection.
 
     Args:
-        inspector: SQLAlchemy inspector
-        table_names: List of table names
+        columns_by_table: Reflected columns keyed by table name
 
     Returns:
         str: Formatted markdown table
     """
-    # Build Markdown table
-    markdown_table = "| table | table_description | column | column_description |\n"
-    markdown_table += "|------|----------|------|----------|\n"
+    # Build Markdown table rows, joined once at the end
+    rows = [
+        "| table | table_description | column | column_description |\n",
+        "|------|----------|------|----------|\n",
+    ]
 
     # Iterate through all tables
-    for table_name in table_names:
-        columns = inspector.get_columns(table_name)
+    for table_name, columns in columns_by_table.items():
         table_description = f"Table with {len(columns)} columns"
 
         # If no columns, show at least one row
         if not columns:
-            markdown_table += f"| {table_name} | {table_description} |  |  |\n"
+            rows.append(f"| {table_name} | {table_description} |  |  |\n")
         else:
             # Process each column
             first_column = True
@@ -218,15 +311,67 @@ def _generate_table_descriptions_from_db(
 
                 if first_column:
                     # First column shows table name and description
-                    markdown_table += f"| {table_name} | {table_description} | {column_name} | {column_description} |\n"
+                    rows.append(
+                        f"| {table_name} | {table_description} | {column_name} | {column_description} |\n"
+                    )
                     first_column = False
                 else:
                     # Subsequent columns don't show table name and description
-                    markdown_table += (
-                        f"|  |  | {column_name} | {column_description} |\n"
+                    rows.append(f"|  |  | {column_name} | {column_description} |\n")
+
+    return "".join(rows)
+
+
+def _generate_table_descriptions_from_sqlite(
+    conn: sqlite3.Connection, table_names: list[str]
+) -> str:
+    """
+    Generate markdown table descriptions from SQLite table metadata.
+
+    Args:
+        conn: sqlite3 connection
+        table_names: List of table names
+
+    Returns:
+        str: Formatted markdown table
+    """
+    # Build Markdown table rows, joined once at the end
+    rows = [
+        "| table | table_description | column | column_description |\n",
+        "|------|----------|------|----------|\n",
+    ]
+
+    # Iterate through all tables
+    for table_name in table_names:
+        columns = conn.execute(
+            'SELECT name, type, "notnull" FROM pragma_table_info(?)', (table_name,)
+        ).fetchall()
+        table_description = f"Table with {len(columns)} columns"
+
+        # If no columns, show at least one row
+        if not columns:
+            rows.append(f"| {table_name} | {table_description} |  |  |\n")
+        else:
+            # Process each column
+            first_column = True
+            for column_name, column_type, not_null in columns:
+                # Declared types are stored as written; uppercase them to
+                # match the casing SQLAlchemy's type names used
+                column_description = f"Type: {column_type.upper() or 'NULL'}"
+                if not_null:
+                    column_description += ", NOT NULL"
+
+                if first_column:
+                    # First column shows table name and description
+                    rows.append(
+                        f"| {table_name} | {table_description} | {column_name} | {column_description} |\n"
                     )
+                    first_column = False
+                else:
+                    # Subsequent columns don't show table name and description
+                    rows.append(f"|  |  | {column_name} | {column_description} |\n")
 
-    return markdown_table
+    return "".join(rows)
 
 
 def _generate_table_descriptions_from_json(database_info: dict) -> str:
@@ -239,9 +384,11 @@ def _generate_table_descriptions_from_json(database_info: dict) -> str:
     Returns:
         str: Formatted markdown table
     """
-    # Build Markdown table
-    markdown_table = "| table | table_description | column | column_description |\n"
-    markdown_table += "|------|----------|------|----------|\n"
+    # Build Markdown table rows, joined once at the end
+    rows = [
+        "| table | table_description | column | column_description |\n",
+        "|------|----------|------|----------|\n",
+    ]
 
     # Iterate through all tables
     for table_name, table_info in database_info.items():
@@ -252,22 +399,22 @@ def _generate_table_descriptions_from_json(database_info: dict) -> str:
 
         # If no columns, show at least one row
         if not columns_description:
-            markdown_table += f"| {table_name} | {table_description} |  |  |\n"
+            rows.append(f"| {table_name} | {table_description} |  |  |\n")
         else:
             # Process each column
             first_column = True
             for column_name, column_description in columns_description.items():
                 if first_column:
                     # First column shows table name and description
-                    markdown_table += f"| {table_name} | {table_description} | {column_name} | {column_description} |\n"
+                    rows.append(
+                        f"| {table_name} | {table_description} | {column_name} | {column_description} |\n"
+                    )
                     first_column = False
                 else:
                     # Subsequent columns don't show table name and description
-                    markdown_table += (
-                        f"|  |  | {column_name} | {column_description} |\n"
-                    )
+                    rows.append(f"|  |  | {column_name} | {column_description} |\n")
 
-    return markdown_table
+    return "".join(rows)
 
 
 def load_eval_data(
@@ -291,12 +438,11 @@ def load_eval_data(
         # Use structured approach with direct parameters
         sql_dialect = sql_dialect or "SQLite"
 
-        with open(eval_path, "r", encoding="utf-8") as file:
-            eval_data = json.load(file)
+        eval_data = _load_json_file(eval_path)
 
         # Decouple question schema - equivalent to decouple_question_schema function
-        question_list, db_path_list, knowledge_list = _decouple_question_schema(
-            datasets=eval_data, db_root_path=db_root_path
+        question_list, db_path_list, db_id_list, knowledge_list = (
+            _decouple_question_schema(datasets=eval_data, db_root_path=db_root_path)
         )
 
         # Validate lengths like in reference code
@@ -311,6 +457,7 @@ def load_eval_data(
         return {
             "question_list": question_list,
             "db_path_list": db_path_list,
+            "db_id_list": db_id_list,
             "knowledge_list": knowledge_list,
             "total_questions": len(question_list),
             "sql_dialect": sql_dialect,
@@ -327,7 +474,7 @@ def load_eval_data(
 
 def _decouple_question_schema(
     datasets: dict, db_root_path: str
-) -> tuple[list[str], list[str], list[str]]:
+) -> tuple[list[str], list[str], list[str], list[str]]:
     """
     Decouple question schema from datasets - equivalent to the reference code's decouple_question_schema function.
 
@@ -336,37 +483,29 @@ def _decouple_question_schema(
         db_root_path: Root path for database files
 
     Returns:
-        Tuple[List[str], List[str], List[str]]: question_list, db_path_list, knowledge_list
+        Tuple[List[str], List[str], List[str], List[str]]: question_list, db_path_list, db_id_list, knowledge_list
     """
     question_list = []
     db_path_list = []
+    db_id_list = []
     knowledge_list = []
+    # Questions share a few databases, so build each db path only once
+    db_path_by_id = {}
 
     for i, data in enumerate(datasets):
         question_list.append(data["question"])
 
         # Construct database path following reference code pattern:
         # cur_db_path = db_root_path + data["db_id"] + "/" + data["db_id"] + ".sqlite"
-        cur_db_path = (
-            db_root_path + "/" + data["db_id"] + "/" + data["db_id"] + ".sqlite"
-        )
+        db_id = data["db_id"]
+        cur_db_path = db_path_by_id.get(db_id)
+        if cur_db_path is None:
+            cur_db_path = os.path.join(db_root_path, db_id, db_id + ".sqlite")
+            db_path_by_id[db_id] = cur_db_path
         db_path_list.append(cur_db_path)
+        db_id_list.append(db_id)
 
         # Add knowledge/evidence if available
         knowledge_list.append(data.get("evidence", data.get("knowledge", "")))
 
-    return question_list, db_path_list, knowledge_list
-
-
-def extract_db_id_from_path(db_path: str) -> str:
-    """
-    Extract database ID from database path.
-
-    Args:
-        db_path (str): Database file path
-
-    Returns:
-        str: Database ID
-    """
-    # Extract db_id from path like: './mini_dev_data/dev_databases/restaurant_1/restaurant_1.sqlite'
-    return db_path.split("/")[-1].split(".sqlite")[0]
+    return question_list, db_path_list, db_id_list, knowledge_list
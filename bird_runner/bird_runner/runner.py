@@ -4,15 +4,11 @@ Provides the main runner functionality for text-to-SQL workflows.
 """
 
 import asyncio
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from .db_tools import (
-    load_eval_data,
-    run_load_db_info,
-    extract_db_id_from_path,
-)
+from .db_tools import load_eval_data, run_load_db_info
 
 from .agent_interface import Agent, AgentFactory
 
@@ -29,6 +25,8 @@ class TextToSQLRunner:
             agent: The agent to use for processing
         """
         self.agent = agent
+        # Executor for blocking schema loads, sized to max_concurrent in run()
+        self._io_pool: ThreadPoolExecutor | None = None
 
     @classmethod
     def from_config(
@@ -57,16 +55,41 @@ class TextToSQLRunner:
         question_index: int | None,
         sql_dialect: str = "SQLite",
         max_concurrent: int = 5,
+        batch: bool = False,
+        agent_timeout: float | None = None,
     ) -> Any:
         eval_data: dict = load_eval_data(eval_path, db_root_path, sql_dialect)
         if question_index is not None:
             return await self._run_one(eval_data, question_index, sql_dialect)
-        else:
-            return await self._run_all(eval_data, eval_path, sql_dialect, max_concurrent)
 
-    async def _run_one(
+        # Give schema loads as many threads as concurrent questions, so the
+        # default executor's size doesn't cap parallelism
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="bird-db"
+        )
+        try:
+            return await self._run_all(
+                eval_data, sql_dialect, max_concurrent, batch, agent_timeout
+            )
+        finally:
+            # Don't wait for loads abandoned by timed-out questions; that
+            # would block the event loop until they finish
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+
+    async def _build_task_data(
         self, eval_data: dict, question_index: int, sql_dialect: str = "SQLite"
     ) -> dict:
+        """Build the state passed to the agent for one question.
+
+        Args:
+            eval_data: Evaluation data returned by load_eval_data
+            question_index: Index of the question
+            sql_dialect: SQL dialect to use
+
+        Returns:
+            The agent state dict for the question
+        """
         total_questions = len(eval_data["question_list"])
         if question_index >= total_questions:
             raise IndexError(
@@ -75,11 +98,11 @@ class TextToSQLRunner:
 
         question = eval_data["question_list"][question_index]
         db_path = eval_data["db_path_list"][question_index]
+        db_id = eval_data["db_id_list"][question_index]
         external_knowledge = eval_data["knowledge_list"][question_index]
-        db_path_list = eval_data["db_path_list"]
-        db_path = db_path_list[question_index]
-        db_id = extract_db_id_from_path(db_path)
-        db_info = run_load_db_info(db_path)
+        db_info = await asyncio.get_running_loop().run_in_executor(
+            self._io_pool, run_load_db_info, db_path
+        )
         schema_info = db_info["schema_info"]
         table_descriptions = db_info["table_descriptions"]
         db_config = {
@@ -98,6 +121,13 @@ class TextToSQLRunner:
             "db_config": db_config,
         }
 
+        return task_data
+
+    async def _run_one(
+        self, eval_data: dict, question_index: int, sql_dialect: str = "SQLite"
+    ) -> dict:
+        task_data = await self._build_task_data(eval_data, question_index, sql_dialect)
+
         try:
             result = await self.agent.ainvoke(task_data)
             return result
@@ -108,56 +138,115 @@ class TextToSQLRunner:
     async def _run_all(
         self,
         eval_data: dict,
-        eval_path: str,
         sql_dialect: str = "SQLite",
         max_concurrent: int = 5,
+        batch: bool = False,
+        agent_timeout: float | None = None,
     ) -> dict:
         """Run text-to-SQL on all questions in the evaluation file concurrently.
 
         Args:
-            eval_path: Path to evaluation JSON file
-            db_root_path: Root path for database files
+            eval_data: Evaluation data returned by load_eval_data
             sql_dialect: SQL dialect to use
-            json_file_path: Path to JSON file for schema descriptions
             max_concurrent: Maximum number of concurrent tasks
+            batch: Submit all questions at once through the agent's abatch
+                method, if it has one
+            agent_timeout: Seconds after which a single question is abandoned
+                and recorded as "Timeout" (None waits indefinitely)
 
         Returns:
             Dictionary containing results for all questions in the specified format
         """
-        # Read all questions from the evaluation file
-        try:
-            with open(eval_path, "r") as f:
-                questions = json.load(f)
-        except Exception as e:
-            logger.error(f"Error reading evaluation file: {e}", exc_info=True)
-            raise
+        if batch:
+            if hasattr(self.agent, "abatch"):
+                return await self._run_batch(eval_data, sql_dialect)
+            logger.warning(
+                "Agent does not implement abatch, processing questions individually"
+            )
+
+        questions = eval_data["question_list"]
+        results: list[str | None] = [None] * len(questions)
+        # Report progress roughly every 10% instead of once per question
+        progress_step = max(1, len(questions) // 10)
+        completed = 0
 
-        async def process_question(i: int, question: dict) -> tuple[int, str]:
+        async def process_question(i: int) -> None:
+            nonlocal completed
+            deadline = asyncio.timeout(agent_timeout)
             try:
-                logger.info(
-                    f"Processing question {i}: {question.get('question', 'N/A')}"
-                )
-                final_sql = await self._run_one(eval_data, i, sql_dialect)
-                return i, final_sql
+                logger.debug(f"Processing question {i}: {questions[i]}")
+                async with deadline:
+                    results[i] = await self._run_one(eval_data, i, sql_dialect)
+            except TimeoutError as e:
+                # Only our deadline counts as a timeout; a TimeoutError raised
+                # by the agent or the schema load is an ordinary error
+                if deadline.expired():
+                    logger.error(f"Question {i} timed out after {agent_timeout}s")
+                    results[i] = "Timeout"
+                else:
+                    logger.error(f"Error processing question {i}: {e}", exc_info=True)
+                    results[i] = "Error"
             except Exception as e:
                 logger.error(f"Error processing question {i}: {e}", exc_info=True)
-                return i, "Error"
+                results[i] = "Error"
+            logger.debug(f"Completed question {i}")
+
+            completed += 1
+            if completed % progress_step == 0 or completed == len(questions):
+                logger.info(f"Completed {completed}/{len(questions)} questions")
 
         # Create semaphore to limit concurrent tasks
         semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def bounded_process(i: int, question: dict) -> tuple[int, str]:
-            async with semaphore:
-                return await process_question(i, question)
+        # Schedule questions grouped by database so each schema is loaded
+        # once and then served from cache; results stay keyed by index
+        db_path_list = eval_data["db_path_list"]
+        order = sorted(range(len(questions)), key=db_path_list.__getitem__)
+
+        # Only create a task once a slot is free, so at most max_concurrent
+        # tasks are alive at any time regardless of the number of questions
+        async with asyncio.TaskGroup() as tg:
+            for i in order:
+                await semaphore.acquire()
+                task = tg.create_task(process_question(i))
+                task.add_done_callback(lambda _: semaphore.release())
 
-        # Create tasks for all questions
-        tasks = [bounded_process(i, question) for i, question in enumerate(questions)]
+        return dict(enumerate(results))
 
-        # Execute all tasks concurrently and collect results
-        results = {}
-        for task in asyncio.as_completed(tasks):
-            i, result = await task
-            results[i] = result
-            logger.info(f"Completed question {i}")
+    async def _run_batch(self, eval_data: dict, sql_dialect: str = "SQLite") -> dict:
+        """Run all questions through the agent's abatch method in one call.
+
+        Args:
+            eval_data: Evaluation data returned by load_eval_data
+            sql_dialect: SQL dialect to use
 
-        return dict(sorted(results.items()))
+        Returns:
+            Dictionary containing results for all questions in the specified format
+        """
+        total_questions = eval_data["total_questions"]
+
+        async def build_state(i: int) -> dict | None:
+            try:
+                return await self._build_task_data(eval_data, i, sql_dialect)
+            except Exception as e:
+                logger.error(f"Error processing question {i}: {e}", exc_info=True)
+                return None
+
+        # Questions whose state can't be built are recorded as "Error" and
+        # left out of the batch, as _run_all does for individual failures
+        states = await asyncio.gather(*map(build_state, range(total_questions)))
+        indices = [i for i, state in enumerate(states) if state is not None]
+        results: list[str] = ["Error"] * total_questions
+        if not indices:
+            return dict(enumerate(results))
+
+        logger.info(f"Submitting {len(indices)} questions as a batch")
+        batch_results = await self.agent.abatch([states[i] for i in indices])
+        if len(batch_results) != len(indices):
+            raise RuntimeError(
+                f"Agent returned {len(batch_results)} results for a batch of "
+                f"{len(indices)} questions"
+            )
+        for i, result in zip(indices, batch_results):
+            results[i] = result
+        return dict(enumerate(results))
@@ -1,15 +1,36 @@
 import asyncio
-from typing import Dict, Any
+import json
+import re
+from typing import Dict, Any, List
+import httpx
 import openai
 from bird_runner import Agent
 from .utils import build_prompt
 
+# Leading ```/```sql and trailing ``` markdown code fences
+_FENCE_RE = re.compile(r"^```(?:sql)?\s*|\s*```$", re.IGNORECASE)
+
 
 class OpenAIAgent(Agent):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        # Size the connection pool to the runner's concurrency so bursts of
+        # requests reuse keep-alive connections instead of opening new ones
+        max_concurrent = config["openai"].get("max_concurrent", 5)
         self.client = openai.AsyncOpenAI(
-            api_key=config["openai"]["api_key"]
+            api_key=config["openai"]["api_key"],
+            # Keep the SDK's client defaults, only overriding the pool limits
+            # and timeout
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_concurrent * 2,
+                    max_keepalive_connections=max_concurrent,
+                ),
+                # Like the SDK default, fail fast when the host can't be reached
+                timeout=httpx.Timeout(
+                    config["openai"].get("timeout", 600.0), connect=5.0
+                ),
+            ),
         )
         
     async def ainvoke(self, state: Dict[str, Any]) -> str:
@@ -30,33 +51,119 @@ class OpenAIAgent(Agent):
             str: Generated SQL query
         """
         try:
-            # Build the prompt from state
-            system_message = self.config["prompt"]["system_message"]
-            user_message = build_prompt(state)
-            
             # Call OpenAI API
             response = await self.client.chat.completions.create(
-                model=self.config["openai"]["model"],
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=self.config["openai"]["temperature"],
-                max_tokens=self.config["openai"]["max_tokens"]
+                **self._build_request(state)
             )
             
-            sql_query = response.choices[0].message.content.strip()
-            
-            # Clean up the SQL (remove markdown formatting if present)
-            if sql_query.startswith("```sql"):
-                sql_query = sql_query[6:]
-            if sql_query.startswith("```"):
-                sql_query = sql_query[3:]
-            if sql_query.endswith("```"):
-                sql_query = sql_query[:-3]
-                
-            return sql_query.strip()
+            return self._clean_sql(response.choices[0].message.content)
             
         except Exception as e:
             print(f"Error generating SQL: {e}")
-            return "SELECT 1;"  # Fallback query
\ No newline at end of file
+            return "SELECT 1;"  # Fallback query
+
+    async def abatch(self, states: List[Dict[str, Any]]) -> List[str]:
+        """
+        Generate SQL for many states through the OpenAI Batch API.
+        
+        Batches are cheaper than real-time requests but may take up to
+        24 hours to complete, so this is meant for offline evaluation runs.
+        
+        Args:
+            states: List of state dicts, as accepted by ainvoke
+        
+        Returns:
+            List[str]: Generated SQL queries, in the same order as states
+        
+        Raises:
+            RuntimeError: If the batch fails after it was created; the message
+                includes the batch id so its results can be recovered
+        """
+        # One chat completion request per state, keyed by its index
+        lines = [
+            json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_request(state),
+            })
+            for i, state in enumerate(states)
+        ]
+        input_file = await self.client.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        
+        # Once the batch exists, errors are raised with its id so the results
+        # can still be fetched, instead of returning fallback queries for all
+        try:
+            # Poll until the batch reaches a terminal state
+            poll_interval = self.config["openai"].get("batch_poll_interval", 30)
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                try:
+                    batch = await self.client.batches.retrieve(batch.id)
+                except (
+                    openai.APIConnectionError,
+                    openai.RateLimitError,
+                    openai.InternalServerError,
+                ) as e:
+                    # Transient failure, the batch keeps running server-side
+                    print(f"Error polling batch {batch.id}, retrying: {e}")
+            
+            if not batch.output_file_id:
+                raise RuntimeError(f"finished with status {batch.status}")
+            
+            output = await self.client.files.content(batch.output_file_id)
+            
+            results = ["SELECT 1;"] * len(states)  # Fallback query
+            for line in output.text.splitlines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                custom_id = record.get("custom_id")
+                response = record.get("response") or {}
+                # A failed or malformed record only loses its own question
+                try:
+                    index = int(custom_id)
+                    if not 0 <= index < len(states):
+                        raise ValueError(f"unknown custom_id {custom_id!r}")
+                    if response.get("status_code") != 200:
+                        raise ValueError(record.get("error"))
+                    content = response["body"]["choices"][0]["message"]["content"]
+                    if content is None:
+                        raise ValueError("empty message content")
+                except (KeyError, IndexError, TypeError, ValueError) as e:
+                    print(f"Error generating SQL for {custom_id}: {e}")
+                    continue
+                results[index] = self._clean_sql(content)
+        except Exception as e:
+            raise RuntimeError(f"Batch {batch.id} failed: {e}") from e
+        
+        return results
+
+    def _build_request(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion request parameters for a state."""
+        # Build the prompt from state
+        system_message = self.config["prompt"]["system_message"]
+        user_message = build_prompt(state)
+        
+        return {
+            "model": self.config["openai"]["model"],
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ],
+            "temperature": self.config["openai"]["temperature"],
+            "max_tokens": self.config["openai"]["max_tokens"],
+        }
+
+    @staticmethod
+    def _clean_sql(content: str) -> str:
+        """Remove markdown formatting from the model output, if present."""
+        return _FENCE_RE.sub("", content.strip()).strip()
\ No newline at end of file
@@ -1,12 +1,11 @@
 import yaml
 import os
-from typing import Optional
 from bird_runner import AgentFactory
 from .agent import OpenAIAgent
 
 
 class OpenAIAgentFactory(AgentFactory):
-    def create_agent(self, config_path: str, storage_root: Optional[str] = None) -> OpenAIAgent:
+    def create_agent(self, config_path: str, storage_root: str | None = None) -> OpenAIAgent:
         """
         Create an OpenAI agent instance.
         
@@ -1,7 +1,226 @@
 import json
 import argparse
+import mmap
+import os
 import random
-from collections import defaultdict
+import re
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, without it the input JSON is parsed in one go
+    ijson = None
+
+
+# Buffer size for streamed reads and writes, large enough to keep syscalls rare
+IO_BUFFER_SIZE = 1 << 20
+
+# Suffix of the pre-serialized entry cache written next to --json_path
+RECORD_CACHE_SUFFIX = '.cache'
+
+# A line holding at least one non-whitespace byte, without its newline
+NON_BLANK_LINE_RE = re.compile(rb'^[^\S\n]*\S[^\n]*', re.MULTILINE)
+
+
+def load_json(path):
+    """Parse a JSON file, using orjson when it is installed.
+
+    orjson parses straight from a read-only memory map of the file, so the
+    file contents are never copied into a bytes object.
+    """
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.loads(f.read())
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return orjson.loads(b'')
+        with mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def iter_non_blank_line_spans(path):
+    """Yield the (start, end) byte offsets of the lines of a file that are not blank.
+
+    The file is memory-mapped and scanned as bytes, without decoding it or
+    building a list of lines.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return
+        with mm:
+            for match in NON_BLANK_LINE_RE.finditer(mm):
+                yield match.span()
+
+
+def index_non_blank_lines(path):
+    """Return arrays with the start and end byte offsets of the non-blank lines of a file."""
+    starts, ends = array('Q'), array('Q')
+    for start, end in iter_non_blank_line_spans(path):
+        starts.append(start)
+        ends.append(end)
+    return starts, ends
+
+
+def read_indexed_lines(path, line_index, indices):
+    """Read the stripped lines at indices as bytes, given (starts, ends) offset arrays."""
+    if not indices:
+        return []
+    starts, ends = line_index
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [mm[starts[i]:ends[i]].strip() for i in indices]
+
+
+def json_items_reader(path):
+    """Return a callable iterating the items of the JSON array stored in path.
+
+    With ijson installed every call streams the file again, so only one item
+    is held in memory at a time. Otherwise the file is parsed once and every
+    call iterates the parsed list.
+    """
+    if ijson is None:
+        items = load_json(path)
+        return lambda: iter(items)
+
+    def stream_items():
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True, buf_size=IO_BUFFER_SIZE)
+
+    return stream_items
+
+
+def pick_items(items, sorted_indices):
+    """Yield the items at sorted_indices, stopping after the last one."""
+    remaining = iter(sorted_indices)
+    target = next(remaining, None)
+    for idx, item in enumerate(items):
+        if target is None:
+            break
+        if idx == target:
+            yield item
+            target = next(remaining, None)
+
+
+def dump_json(obj, path, pretty=False):
+    """Write obj as compact JSON, or indented by 2 spaces if pretty, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None))
+    else:
+        # Write non-ASCII as UTF-8 like orjson, so both paths give the same bytes
+        with open(path, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(obj, f, separators=(',', ':'), ensure_ascii=False)
+
+
+def serialize_record(item, pretty=False):
+    """Serialize one entry exactly as dump_json lays it out inside the output array."""
+    if not pretty:
+        if orjson is not None:
+            return orjson.dumps(item)
+        return json.dumps(item, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if orjson is not None:
+        data = orjson.dumps(item, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(item, indent=2, ensure_ascii=False).encode('utf-8')
+    # Entries sit one level deep in the array. Serialized JSON strings never
+    # contain raw newlines, so every line can simply be indented.
+    return b'  ' + data.replace(b'\n', b'\n  ')
+
+
+def source_stamp(path, pretty=False):
+    """Identify a version of the input file and the serializer and layout used for it."""
+    st = os.stat(path)
+    serializer = 'orjson' if orjson is not None else 'json'
+    return [st.st_size, st.st_mtime_ns, serializer, 'pretty' if pretty else 'compact']
+
+
+class RecordCache:
+    """Sidecar file holding every input entry serialized for the output JSON.
+
+    Layout: the serialized entries back to back, an array('Q') with the start
+    offset of each entry plus the end offset, a JSON header with the source
+    stamp and the difficulty of every entry, and finally the positions of the
+    offset table and of the header as two uint64 values.
+    """
+
+    def __init__(self, mm, offsets, difficulties):
+        self.mm = mm
+        self.offsets = offsets
+        self.difficulties = difficulties
+
+    @classmethod
+    def load(cls, cache_path, stamp):
+        """Open the cache, or return None if it is missing, corrupt or stale."""
+        try:
+            with open(cache_path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            offsets_pos, header_pos = array('Q', mm[-16:])
+            header = json.loads(mm[header_pos:-16])
+            if header["source"] != stamp:
+                raise ValueError("stale record cache")
+            offsets = array('Q')
+            offsets.frombytes(mm[offsets_pos:header_pos])
+            return cls(mm, offsets, header["difficulties"])
+        except (ValueError, KeyError, TypeError):
+            mm.close()
+            return None
+
+    @staticmethod
+    def build(cache_path, stamp, items, pretty=False):
+        """Serialize all items into a new cache file at cache_path."""
+        offsets = array('Q', [0])
+        difficulties = []
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                for item in items:
+                    record = serialize_record(item, pretty)
+                    f.write(record)
+                    offsets.append(offsets[-1] + len(record))
+                    difficulties.append(item["difficulty"])
+                offsets_pos = offsets[-1]
+                header_pos = offsets_pos + len(offsets) * offsets.itemsize
+                f.write(offsets.tobytes())
+                f.write(json.dumps({"source": stamp, "difficulties": difficulties}).encode('utf-8'))
+                f.write(array('Q', [offsets_pos, header_pos]).tobytes())
+        except BaseException:
+            # Don't leave a partial cache behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # Only expose complete caches
+        os.replace(tmp_path, cache_path)
+
+    def write_subset(self, indices, path, pretty=False):
+        """Write the entries at indices as a JSON array, byte-identical to dump_json."""
+        with open(path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            if not indices:
+                f.write(b'[]')
+                return
+            records = (self.mm[self.offsets[i]:self.offsets[i + 1]] for i in indices)
+            if pretty:
+                f.write(b'[\n' + b',\n'.join(records) + b'\n]')
+            else:
+                f.write(b'[' + b','.join(records) + b']')
+
+    def close(self):
+        self.mm.close()
+
 
 def main():
     parser = argparse.ArgumentParser(description="Create a subset of evaluation data.")
@@ -13,52 +232,83 @@ def main():
     parser.add_argument("--moderate", type=int, default=10, help="Number of moderate queries to select.")
     parser.add_argument("--challenging", type=int, default=10, help="Number of challenging queries to select.")
     parser.add_argument("--seed", type=int, default=133, help="Random seed for sampling.")
+    parser.add_argument("--pretty", action="store_true", help="Indent the output JSON by 2 spaces instead of writing it compact.")
+    parser.add_argument("--record_cache", action="store_true", help="Keep pre-serialized entries next to the input JSON to speed up repeated runs.")
 
     args = parser.parse_args()
-    random.seed(args.seed)
+    # A private generator yields the same samples as seeding the global one
+    rng = random.Random(args.seed)
 
-    # Load JSON data
-    with open(args.json_path, 'r') as f:
-        json_data = json.load(f)
+    # Group indices by difficulty, without keeping the entries themselves.
+    # Compact int arrays are a fraction of the size of lists of ints, and
+    # difficulties that are never sampled are not collected at all.
+    grouped = {"simple": array('i'), "moderate": array('i'), "challenging": array('i')}
+    num_items = 0
     
-    # Load SQL lines
-    with open(args.sql_path, 'r') as f:
-        sql_lines = [line.strip() for line in f if line.strip()]
+    # The gold SQL file is indexed on a worker thread while the JSON entries
+    # are read here, so reads of the two independent files overlap
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        sql_index = executor.submit(index_non_blank_lines, args.sql_path)
+        
+        # With --record_cache, entries come pre-serialized from a sidecar file
+        # and the input JSON is only decoded when that cache is (re)built
+        record_cache = None
+        if args.record_cache:
+            cache_path = args.json_path + RECORD_CACHE_SUFFIX
+            stamp = source_stamp(args.json_path, args.pretty)
+            record_cache = RecordCache.load(cache_path, stamp)
+            if record_cache is None:
+                RecordCache.build(cache_path, stamp, json_items_reader(args.json_path)(), args.pretty)
+                record_cache = RecordCache.load(cache_path, stamp)
+            difficulties = iter(record_cache.difficulties)
+        else:
+            iter_json_items = json_items_reader(args.json_path)
+            difficulties = (item["difficulty"] for item in iter_json_items())
+        
+        for idx, difficulty in enumerate(difficulties):
+            bucket = grouped.get(difficulty)
+            if bucket is not None:
+                bucket.append(idx)
+            num_items += 1
+        
+        sql_starts, sql_ends = sql_index.result()
     
-    if len(json_data) != len(sql_lines):
+    if num_items != len(sql_starts):
         raise ValueError("JSON and SQL file must have the same number of entries.")
     
-    # Group by difficulty
-    grouped = defaultdict(list)
-    for idx, item in enumerate(json_data):
-        grouped[item["difficulty"]].append((idx, item))
-    
     # Sample entries
-    selected_indices = set()
+    selected_indices = []
+    sample_counts = {}
+    warnings = []
     for diff, count in [("simple", args.simple), ("moderate", args.moderate), ("challenging", args.challenging)]:
-        available = grouped.get(diff, [])
+        available = grouped[diff]
         if len(available) < count:
-            print(f"Warning: Requested {count} {diff} samples, but only {len(available)} available.")
-        samples = random.sample(available, min(count, len(available)))
-        selected_indices.update(idx for idx, _ in samples)
+            warnings.append(f"Warning: Requested {count} {diff} samples, but only {len(available)} available.\n")
+        samples = rng.sample(available, min(count, len(available)))
+        selected_indices.extend(samples)
+        sample_counts[diff] = len(samples)
     
     # Sort indices to preserve order
     sorted_indices = sorted(selected_indices)
     
-    # Create subsets
-    subset_json = [json_data[i] for i in sorted_indices]
-    subset_sql = [sql_lines[i] for i in sorted_indices]
-    
-    # Write outputs
-    with open(args.output_json, 'w') as f:
-        json.dump(subset_json, f, indent=2)
-    with open(args.output_sql, 'w') as f:
-        f.write("\n".join(subset_sql) + "\n")
+    # Create and write subsets, reading back only the selected JSON entries
+    if record_cache is not None:
+        record_cache.write_subset(sorted_indices, args.output_json, args.pretty)
+        record_cache.close()
+    else:
+        subset_json = list(pick_items(iter_json_items(), sorted_indices))
+        dump_json(subset_json, args.output_json, args.pretty)
+    subset_sql = read_indexed_lines(args.sql_path, (sql_starts, sql_ends), sorted_indices)
+    with open(args.output_sql, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.writelines(sql + b"\n" for sql in subset_sql)
     
-    print(f"Created subset with {len(subset_json)} entries.")
-    print(f"- Simple: {len([x for x in subset_json if x['difficulty']=='simple'])}")
-    print(f"- Moderate: {len([x for x in subset_json if x['difficulty']=='moderate'])}")
-    print(f"- Challenging: {len([x for x in subset_json if x['difficulty']=='challenging'])}")
+    sys.stderr.writelines(warnings)
+    sys.stdout.write(
+        f"Created subset with {len(sorted_indices)} entries.\n"
+        f"- Simple: {sample_counts['simple']}\n"
+        f"- Moderate: {sample_counts['moderate']}\n"
+        f"- Challenging: {sample_counts['challenging']}\n"
+    )
 
 if __name__ == "__main__":
     main()